@@ -22,6 +22,16 @@ items = config.xpath('//*[ip:is-net-ip4(.)', namespaces=ip_ns)
 
 print(items[0].text)
 # >>> 10.10.0.0/16
+
+Notes
+-----
+
+The extension functions cache their results keyed by element text value.  When the XPath expression
+itself returns strings, such as '//*[ip:ip4-net(.)]/text()', lxml returns "smart strings" that each keep
+a reference to their parent element and so the whole document alive.  If you do not need getparent() on
+those results, pass smart_strings=False to xpath():
+
+items = config.xpath('//*[ip:ip4-net(.)]/text()', namespaces=ip_ns, smart_strings=False)
 """
 
 from lxml_xpath_ipaddress.func_namespace import ns as ip_ns
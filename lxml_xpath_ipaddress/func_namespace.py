@@ -1,8 +1,9 @@
 from functools import wraps
 from lxml.etree import FunctionNamespace
 
-from lxml_xpath_ipaddress.in_subnet import in_subnet
+from lxml_xpath_ipaddress.in_subnet import in_subnet, in_subnets, _canonical_subnet, _in_subnet_check, _to_subnet
 from lxml_xpath_ipaddress.ip4or6 import *
+from lxml_xpath_ipaddress.parse import _parse_ip
 
 
 NAMESPACE = 'https://github.com/jeremyschulman/lxml-xpath-ipaddress'
@@ -26,14 +27,24 @@ ns = {'ip': NAMESPACE}
 # -----------------------------------------------------------------------------------------------------------------
 
 def make_nsf(func):
+    """
+    Returns an lxml extension function that calls the given validator function with the text value of the
+    first element of the node-set argument; False if there is no such text value, for example an empty
+    node-set, or an XPath string or number argument.  These are checked explicitly rather than by catching
+    an exception since the miss case is common.
+
+    The text value is always passed as a plain str so that the validator caches, which are keyed by value,
+    never hold an lxml "smart string" and with it a reference to the owning document.
+    """
 
     @wraps(func)
     def wrapper(dummy, ele):
-        try:
-            return func(ele[0].text)
-        except:
+        if not isinstance(ele, list) or not ele:
             return False
 
+        value = getattr(ele[0], 'text', None)
+        return func(str(value)) if value is not None else False
+
     return wrapper
 
 
@@ -58,13 +69,94 @@ def nsf_in_subnet(dummy, ele, subnet):
         True if the given element text value is an IP thing and is within the given subnet value
         False otherwise
     """
-    try:
-        value = ele[0].text
-        return in_subnet(value, subnet)
+    if not isinstance(ele, list) or not ele:
+        return False
+
+    value = getattr(ele[0], 'text', None)
+    return in_subnet(str(value), subnet) if value is not None else False
 
-    except:
+
+def nsf_in_subnets(dummy, ele, *subnets):
+    """
+    lxml extension function wrapping in_subnets; the element text value is parsed once and checked against
+    all of the given subnets, for example:
+
+        config.xpath('//*[ip:in-subnets(., "10.0.0.0/8", "192.168.0.0/16", "172.16.0.0/12")]', namespaces=ns)
+
+    Parameters
+    ----------
+    dummy
+        Not used
+
+    ele : Element
+        The lxml element to check
+
+    subnets : str
+        The subnet string values
+
+    Returns
+    -------
+    bool
+        True if the given element text value is an IP thing and is within any of the given subnet values
+        False otherwise
+    """
+    if not isinstance(ele, list) or not ele:
         return False
 
+    value = getattr(ele[0], 'text', None)
+    return in_subnets(str(value), tuple(map(str, subnets))) if value is not None else False
+
+
+def nsf_ip4_batch_in_subnet(dummy, nodes, subnet):
+    """
+    lxml extension function that filters an entire node-set down to the elements whose text value is an
+    IPv4 thing within the given IPv4 subnet.  This evaluates the subnet once for the whole node-set rather
+    than once per element, for example:
+
+        config.xpath('ip:ip4-batch-in-subnet(//*, "10.10.0.0/16")', namespaces=ns)
+
+    Parameters
+    ----------
+    dummy
+        Not used
+
+    nodes : list
+        The lxml node-set to filter
+
+    subnet : str
+        The IPv4 subnet string value
+
+    Returns
+    -------
+    list
+        The elements of the node-set that are within the given subnet; empty if the subnet value is not
+        a valid IPv4 subnet
+    """
+    if not isinstance(nodes, list):
+        return []
+
+    try:
+        version = _to_subnet(subnet)[2]
+    except ValueError:
+        return []
+
+    if version != 4:
+        return []
+
+    check = _in_subnet_check(_canonical_subnet(subnet))
+    found = []
+
+    for node in nodes:
+        value = getattr(node, 'text', None)
+        if value is None:
+            continue
+
+        ip = _parse_ip(str(value))
+        if ip is not None and check(ip):
+            found.append(node)
+
+    return found
+
 
 # -----------------------------------------------------------------------------------------------------------------
 # Bind functions into LXML namespace object
@@ -83,3 +175,5 @@ _ns_ext['ip4-net'] = make_nsf(is_net_ip4)
 _ns_ext['ip4-host'] = make_nsf(is_host_ip4)
 
 _ns_ext['in-subnet'] = nsf_in_subnet
+_ns_ext['in-subnets'] = nsf_in_subnets
+_ns_ext['ip4-batch-in-subnet'] = nsf_ip4_batch_in_subnet
@@ -1,7 +1,15 @@
 import ipaddress
 from functools import lru_cache
 
+from lxml_xpath_ipaddress.parse import _INTERFACES, _parse, _parse_ip
+from lxml_xpath_ipaddress.subnet_trie import SubnetTrie
 
+# subnet lists at least this long are checked with a longest-prefix match trie rather than a linear scan
+
+_TRIE_MIN_SUBNETS = 16
+
+
+@lru_cache(maxsize=4096)
 def ip_only(value):
     """
     Returns only the IP address string of the value provided.  The value could be either an IP address,
@@ -20,22 +28,32 @@ def ip_only(value):
     None
         If the value provided is not an IP thing
     """
-    for test in [lambda x: str(ipaddress.ip_address(x)),
-                 lambda x: str(ipaddress.ip_interface(x).ip),
-                 lambda x: str(ipaddress.ip_network(x).network_address)]:
-        try:
-            return test(value)
+    ip = _parse_ip(value)
+    return str(ip) if ip is not None else None
 
-        except:
-            pass
 
-    return None
+@lru_cache(maxsize=1024)
+def _subnet_ints(subnet):
+    """ used by _to_subnet to cache the conversion of canonical subnet string values """
+    net = ipaddress.ip_network(subnet)
+    return int(net.network_address), int(net.netmask), net.version
+
+
+def _canonical_subnet(subnet):
+    """
+    used to canonicalize subnet values before any cache lookup so that, for example, "2001:DB8::/32 " and
+    "2001:db8::/32" share one cache entry.
+    """
+    return str(subnet).strip().lower()
 
 
-@lru_cache()
 def _to_subnet(subnet):
-    """ used to cache subnet conversions used by in_subnet """
-    return ipaddress.ip_network(subnet)
+    """
+    used to convert subnet values used by in_subnet into a tuple of ( network int, netmask int, version )
+    so that membership is a plain integer mask-and-compare.  clear_subnet_caches() clears this cache along
+    with the in_subnet and in_subnets caches built from it.
+    """
+    return _subnet_ints(_canonical_subnet(subnet))
 
 
 def in_subnet(value, subnet):
@@ -56,8 +74,184 @@ def in_subnet(value, subnet):
         True if the value is in the subnet
         False otherwise; which could be the case if the value is not an IP thing.
     """
+    # parse the value first; most element text values are not IP things and need no subnet lookup at all
+
+    try:
+        ip = _parse_ip(value)
+        if ip is None:
+            return False
+
+        return _in_subnet_check(_canonical_subnet(subnet))(ip)
+
+    except (ValueError, TypeError):
+        return False
+
+
+def _never_in_subnet(ip):
+    """ used by _in_subnet_check for subnet values that are not valid IP subnets """
+    return False
+
+
+@lru_cache(maxsize=1024)
+def _in_subnet_check(subnet):
+    """
+    used to cache the membership check used by in_subnet for a given canonical subnet value; a function of
+    an ipaddress address object that closes over the subnet ( network int, netmask int, version ) values.
+    """
+    try:
+        net_int, mask_int, version = _to_subnet(subnet)
+    except ValueError:
+        return _never_in_subnet
+
+    def check(ip):
+        return ip.version == version and int(ip) & mask_int == net_int
+
+    return check
+
+
+class SubnetTable(dict):
+    """ the prepared form of a list of IP subnets, as returned by subnet_table, keyed by IP version """
+
+
+@lru_cache(maxsize=256)
+def _to_subnet_table(subnets):
+    """
+    used to cache subnet-list conversions used by subnet_table and in_subnets.  Each IP version is stored
+    as a pair of ( mask groups, None ) for short lists, where the mask groups are ( netmask int, set of
+    network ints ) pairs, one per distinct netmask; or ( exact-match set, SubnetTrie ) for long lists.
+    Invalid subnet values are dropped.
+    """
+    table = {4: ([], [], []), 6: ([], [], [])}
+
+    for subnet in subnets:
+        try:
+            net_int, mask_int, version = _to_subnet(subnet)
+        except ValueError:
+            continue
+
+        nets, masks, prefixlens = table[version]
+        nets.append(net_int)
+        masks.append(mask_int)
+        prefixlens.append(bin(mask_int).count('1'))
+
+    if len(subnets) < _TRIE_MIN_SUBNETS:
+
+        # grouping the networks by netmask means a value is checked with one mask-and-probe per distinct
+        # netmask, rather than one mask-and-compare per subnet.
+
+        groups = {}
+
+        for version, (nets, masks, _) in table.items():
+            by_mask = {}
+            for net_int, mask_int in zip(nets, masks):
+                by_mask.setdefault(mask_int, set()).add(net_int)
+
+            groups[version] = (tuple((mask_int, frozenset(nets)) for mask_int, nets in by_mask.items()), None)
+
+        return SubnetTable(groups)
+
+    # for long lists the set of (network, prefixlen) keys answers the common case of a value that is exactly
+    # one of the subnets, or a host listed as a /32 (/128), with a single hash probe before walking the trie.
+
+    tries = {}
+
+    for version, (nets, _, prefixlens) in table.items():
+        trie = SubnetTrie(32 if version == 4 else 128)
+        for net_int, prefixlen in zip(nets, prefixlens):
+            trie.insert(net_int, prefixlen, True)
+
+        tries[version] = (frozenset(zip(nets, prefixlens)), trie)
+
+    return SubnetTable(tries)
+
+
+def subnet_table(subnets):
+    """
+    Returns the prepared form of the given IP subnets for use with in_subnets.  Preparing the subnets copies
+    and hashes the whole list to find its cached table, which is O(N) in the number of subnets; so when the
+    same long list is checked against many values, prepare it once and pass the result to in_subnets:
+
+        table = subnet_table(subnets)
+        found = [value for value in values if in_subnets(value, table)]
+
+    Parameters
+    ----------
+    subnets : iterable of str
+        The IP subnet string values; any that are not valid IP subnets are ignored.  A single subnet
+        string is treated as a list of one subnet.
+
+    Returns
+    -------
+    SubnetTable
+    """
+    return _to_subnet_table((subnets,) if isinstance(subnets, str) else tuple(subnets))
+
+
+def in_subnets(value, subnets):
+    """
+    Determines if the given value (ip thing) is within any of the given IP subnets.  The value is parsed
+    only once and then checked against the subnets using integer network and netmask values, or a
+    longest-prefix match trie when there are many subnets.
+
+    Given a list of subnet values, each call first prepares the list as subnet_table does, at O(N) cost
+    in the number of subnets.  Given a SubnetTable from subnet_table, the check itself takes only a few
+    set probes, or at most 32 (IPv4) / 128 (IPv6) trie steps, however many subnets there are.
+
+    Parameters
+    ----------
+    value : str
+        The IP thing to check
+
+    subnets : iterable of str, or SubnetTable
+        The IP subnet string values; any that are not valid IP subnets are ignored.  A single subnet
+        string is treated as a list of one subnet.  Or the table returned by subnet_table.
+
+    Returns
+    -------
+    bool
+        True if the value is in any of the subnets
+        False otherwise; which could be the case if the value is not an IP thing.
+    """
     try:
-        return ipaddress.ip_address(ip_only(value)) in _to_subnet(subnet)
+        obj = _parse(value)
+        if obj is None:
+            return False
+
+        if not isinstance(subnets, SubnetTable):
+            subnets = subnet_table(subnets)
 
-    except:
+    except (ValueError, TypeError):
         return False
+
+    version_table = subnets[obj.version]
+    is_iface = isinstance(obj, _INTERFACES)
+    ip_int = int(obj.ip) if is_iface else int(obj)
+
+    if version_table[1] is None:
+        for mask_int, nets in version_table[0]:
+            if (ip_int & mask_int) in nets:
+                return True
+
+        return False
+
+    exact, trie = version_table
+
+    if is_iface:
+        network = obj.network
+        exact_key = (int(network.network_address), network.prefixlen)
+    else:
+        exact_key = (ip_int, obj.max_prefixlen)
+
+    if exact_key in exact:
+        return True
+
+    return trie.lookup(ip_int) is not None
+
+
+def clear_subnet_caches():
+    """
+    Clears the cached subnet conversions and every in_subnet and in_subnets cache built from them.
+    """
+    _subnet_ints.cache_clear()
+    _in_subnet_check.cache_clear()
+    _to_subnet_table.cache_clear()
@@ -1,9 +1,21 @@
-from ipaddress import IPv4Address, IPv4Interface, IPv4Network
+from functools import lru_cache
+from ipaddress import IPv4Address, IPv4Interface
+
+from lxml_xpath_ipaddress.parse import _V4_SHAPE, _parse
+
+# fipv is an optional C validator.  It is more lenient than the ipaddress module (it permits
+# leading zeros), so it is only ever used to reject a value early, never to accept one.
+
+try:
+    import fipv
+except ImportError:
+    fipv = None
 
 # ----------------------------------------------------------------------------
 # IPv4 functions
 # ----------------------------------------------------------------------------
 
+@lru_cache(maxsize=4096)
 def is_any_ip4(value):
     """
     Determine if this given value is an IPv4 address, an IPv4 network value, or an IPv4 interface value;
@@ -20,16 +32,14 @@ def is_any_ip4(value):
         True if the value is any valid IPv4 thing
         False otherwise
     """
-    for test in [IPv4Network, IPv4Interface, IPv4Address]:
-        try:
-            return bool(test(value))
-
-        except:
-            pass
+    if not isinstance(value, str) or not _V4_SHAPE.fullmatch(value):
+        return False
 
-    return False
+    obj = _parse(value)
+    return obj is not None and obj.version == 4
 
 
+@lru_cache(maxsize=4096)
 def is_net_ip4(value):
     """
     Determine if this given value is an IPv4 network value or an IPv4 interface value;
@@ -46,17 +56,29 @@ def is_net_ip4(value):
         True if the value is any valid IPv4 thing
         False otherwise
     """
-    for test in [lambda x: IPv4Network(x)._prefixlen != 32,
-                 lambda x: IPv4Interface(x)._prefixlen != 32]:
-        try:
-            return bool(test(value))
+    if not isinstance(value, str) or not _V4_SHAPE.fullmatch(value):
+        return False
 
-        except:
-            pass
+    # a value without a prefix, or with a /32 prefix, is a host and not a network; there is no
+    # need to build the network object to find that out.
 
-    return False
+    slash = value.rfind('/')
+    if slash < 0:
+        return False
 
+    prefix = value[slash + 1:]
+    if prefix.isdigit():
+        if int(prefix) == 32:
+            return False
 
+        if fipv is not None and not fipv.ipv4_cidr(value):
+            return False
+
+    obj = _parse(value)
+    return isinstance(obj, IPv4Interface) and obj._prefixlen != 32
+
+
+@lru_cache(maxsize=4096)
 def is_host_ip4(value):
     """
     Determine if this given value is an IPv4 address value as defined by the ipaddress module.
@@ -72,10 +94,12 @@ def is_host_ip4(value):
         True if the value is any valid IPv4 thing
         False otherwise
     """
-    try:
-        return bool(IPv4Address(value))
+    if not isinstance(value, str) or not _V4_SHAPE.fullmatch(value):
+        return False
+
+    if fipv is not None and not fipv.ipv4(value):
+        return False
 
-    except:
-        pass
+    # an IPv4Interface is also an IPv4Address subclass, so compare the exact type
 
-    return False
+    return type(_parse(value)) is IPv4Address
@@ -1,11 +1,15 @@
+from functools import lru_cache
+
 from lxml_xpath_ipaddress.ip4 import *
 from lxml_xpath_ipaddress.ip6 import *
+from lxml_xpath_ipaddress.parse import _parse
 
 
 # -----------------------------------------------------------------------------------------------------------------
 # IP any family
 # -----------------------------------------------------------------------------------------------------------------
 
+@lru_cache(maxsize=4096)
 def is_any_ip(value):
     """
     Determine if this given value is an IP address, an IP network value, or an IP interface value;
@@ -22,9 +26,10 @@ def is_any_ip(value):
         True if the value is any valid IP thing
         False otherwise
     """
-    return is_any_ip4(value) or is_any_ip6(value)
+    return _parse(value) is not None
 
 
+@lru_cache(maxsize=4096)
 def is_host_ip(value):
     """
     Determine if this given value is an IP address as defined by the ipaddress module;
@@ -45,6 +50,7 @@ def is_host_ip(value):
     return is_host_ip4(value) or is_host_ip6(value)
 
 
+@lru_cache(maxsize=4096)
 def is_net_ip(value):
     """
     Determine if this given value is an IP network value, or an IP interface value;
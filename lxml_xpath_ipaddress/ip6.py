@@ -1,9 +1,13 @@
-import ipaddress
+from functools import lru_cache
+from ipaddress import IPv6Address, IPv6Interface
+
+from lxml_xpath_ipaddress.parse import _V6_SHAPE, _parse
 
 # ----------------------------------------------------------------------------
 # IPv6 functions
 # ----------------------------------------------------------------------------
 
+@lru_cache(maxsize=4096)
 def is_any_ip6(value):
     """
     Determine if this given value is an IPv6 address, an IPv6 network value,
@@ -20,16 +24,14 @@ def is_any_ip6(value):
         True if the value is any valid IP thing
         False otherwise
     """
-    for test in [ipaddress.IPv6Network, ipaddress.IPv6Interface, ipaddress.IPv6Address]:
-        try:
-            return bool(test(value))
-
-        except:
-            pass
+    if not isinstance(value, str) or not _V6_SHAPE.fullmatch(value):
+        return False
 
-    return False
+    obj = _parse(value)
+    return obj is not None and obj.version == 6
 
 
+@lru_cache(maxsize=4096)
 def is_host_ip6(value):
     """
     Determine if this given value is an IPv6 address value as defined by the ipaddress module.
@@ -45,13 +47,15 @@ def is_host_ip6(value):
         True if the value is any valid IP thing
         False otherwise
     """
-    try:
-        return bool(ipaddress.IPv6Address(value))
+    if not isinstance(value, str) or not _V6_SHAPE.fullmatch(value):
+        return False
+
+    # an IPv6Interface is also an IPv6Address subclass, so compare the exact type
 
-    except:
-        pass
+    return type(_parse(value)) is IPv6Address
 
 
+@lru_cache(maxsize=4096)
 def is_net_ip6(value):
     """
     Determine if this given value is an IPv6 network value or an IPv6 interface value
@@ -68,13 +72,20 @@ def is_net_ip6(value):
         True if the value is any valid IP thing
         False otherwise
     """
-    for test in [lambda x: ipaddress.IPv6Network(x)._prefixlen != 128,
-                 lambda x: ipaddress.IPv6Interface(x)._prefixlen != 128]:
-        try:
-            return bool(test(value))
+    if not isinstance(value, str) or not _V6_SHAPE.fullmatch(value):
+        return False
+
+    # a value without a prefix, or with a /128 prefix, is a host and not a network; there is no
+    # need to build the network object to find that out.
+
+    slash = value.rfind('/')
+    if slash < 0:
+        return False
 
-        except:
-            pass
+    prefix = value[slash + 1:]
+    if prefix.isdigit() and int(prefix) == 128:
+        return False
 
-    return False
+    obj = _parse(value)
+    return isinstance(obj, IPv6Interface) and obj._prefixlen != 128
 
@@ -0,0 +1,63 @@
+import re
+from functools import lru_cache
+from ipaddress import IPv4Interface, IPv6Interface, ip_address, ip_interface
+
+# loose shape of anything the ipaddress module could accept as an IPv4 thing, including the
+# netmask / hostmask prefix forms.  This is only a fast reject filter, not a validator.
+
+_V4_SHAPE = re.compile(r'[0-9.]+(?:/[0-9.]+)?')
+
+# loose shape of anything the ipaddress module could accept as an IPv6 thing, including the
+# embedded IPv4 tail and the scope id.  This is only a fast reject filter, not a validator.
+
+_V6_SHAPE = re.compile(r'[0-9a-fA-F:.]+(?:%[^/]+)?(?:/[0-9]+)?')
+
+
+@lru_cache(maxsize=8192)
+def _parse(value):
+    """
+    Parses the given value into an ipaddress object once, so that the various validator functions
+    checking the same element text value share a single parse.
+
+    Parameters
+    ----------
+    value : str
+        The value to parse; any other type is not an IP thing
+
+    Returns
+    -------
+    IPv4Address, IPv6Address
+        If the value is an IP address; that is it has no prefix
+
+    IPv4Interface, IPv6Interface
+        If the value is an IP network or IP interface value; that is it has a prefix
+
+    None
+        If the value is not an IP thing
+    """
+    if not isinstance(value, str):
+        return None
+
+    if not (_V4_SHAPE.fullmatch(value) or _V6_SHAPE.fullmatch(value)):
+        return None
+
+    try:
+        if '/' in value:
+            return ip_interface(value)
+
+        return ip_address(value)
+
+    except ValueError:
+        return None
+
+
+_INTERFACES = (IPv4Interface, IPv6Interface)
+
+
+def _parse_ip(value):
+    """
+    Returns the IP address object of the given value; the address itself, the address part of an interface
+    value, or the network address of a network value.  None if the value is not an IP thing.
+    """
+    obj = _parse(value)
+    return obj.ip if isinstance(obj, _INTERFACES) else obj
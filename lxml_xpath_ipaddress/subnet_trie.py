@@ -0,0 +1,87 @@
+# ----------------------------------------------------------------------------
+# Longest-prefix match over a set of IP subnets
+# ----------------------------------------------------------------------------
+
+
+class SubnetTrie(object):
+    """
+    A uni-bit trie of IP subnets, keyed on the network address bits, that provides a longest-prefix
+    match lookup in at most `width` steps regardless of the number of subnets stored.
+
+    Examples
+    --------
+
+    trie = SubnetTrie(32)
+    trie.insert(int(IPv4Address('10.0.0.0')), 8, '10.0.0.0/8')
+    trie.insert(int(IPv4Address('10.10.0.0')), 16, '10.10.0.0/16')
+
+    trie.lookup(int(IPv4Address('10.10.1.1')))
+    # >>> '10.10.0.0/16'
+    """
+
+    def __init__(self, width):
+        """
+        Parameters
+        ----------
+        width : int
+            The address width in bits; 32 for IPv4, 128 for IPv6
+        """
+        self.width = width
+
+        # each node is a list of [zero-child, one-child, payload]
+
+        self._root = [None, None, None]
+
+    def insert(self, net_int, prefixlen, payload):
+        """
+        Adds a subnet to the trie.
+
+        Parameters
+        ----------
+        net_int : int
+            The subnet network address as an integer
+
+        prefixlen : int
+            The subnet prefix length
+
+        payload
+            The (not None) value returned by lookup when this is the longest matching subnet
+        """
+        node = self._root
+
+        for bit in range(self.width - 1, self.width - 1 - prefixlen, -1):
+            branch = (net_int >> bit) & 1
+            if node[branch] is None:
+                node[branch] = [None, None, None]
+            node = node[branch]
+
+        node[2] = payload
+
+    def lookup(self, ip_int):
+        """
+        Finds the longest subnet in the trie that contains the given address.
+
+        Parameters
+        ----------
+        ip_int : int
+            The IP address as an integer
+
+        Returns
+        -------
+        The payload of the longest matching subnet
+
+        None
+            If no subnet in the trie contains the address
+        """
+        node = self._root
+        found = node[2]
+
+        for bit in range(self.width - 1, -1, -1):
+            node = node[(ip_int >> bit) & 1]
+            if node is None:
+                break
+
+            if node[2] is not None:
+                found = node[2]
+
+        return found
@@ -19,6 +19,7 @@ setup(
     author='jschulman@juniper.net',
     packages=find_packages(),
     install_requires=requirements(),
+    extras_require={'fast': ['fipv']},
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -0,0 +1,61 @@
+import os
+
+import pytest
+from lxml import etree
+
+from lxml_xpath_ipaddress import ip_ns
+
+
+@pytest.fixture(scope='module')
+def config():
+    return etree.parse(os.path.join(os.path.dirname(__file__), 'config.xml'))
+
+
+def _texts(items):
+    return [item.text for item in items]
+
+
+@pytest.mark.parametrize('subnet', ['172.18.0.0/16', '10.10.201.0/24', '10.0.0.0/8', '0.0.0.0/0'])
+def test_ip4_batch_in_subnet_matches_in_subnet(config, subnet):
+    batch = config.xpath('ip:ip4-batch-in-subnet(//*, "%s")' % subnet, namespaces=ip_ns)
+    each = config.xpath('//*[ip:in-subnet(., "%s")]' % subnet, namespaces=ip_ns)
+
+    assert batch
+    assert batch == each
+
+
+@pytest.mark.parametrize('subnet', ['::/0', '2001:db8::/32', 'bad', '10.1.1.1/8'])
+def test_ip4_batch_in_subnet_non_ip4_subnet(config, subnet):
+    assert config.xpath('ip:ip4-batch-in-subnet(//*, "%s")' % subnet, namespaces=ip_ns) == []
+
+
+def test_ip4_batch_in_subnet_not_a_node_set(config):
+    assert config.xpath('ip:ip4-batch-in-subnet("10.1.1.1", "10.0.0.0/8")', namespaces=ip_ns) == []
+    assert config.xpath('ip:ip4-batch-in-subnet(1, "10.0.0.0/8")', namespaces=ip_ns) == []
+
+
+# fewer than 16 subnets go through the netmask-grouped table, 16 or more through the trie
+
+_IN_SUBNETS_LISTS = [
+    ['172.18.0.0/16'],
+    ['172.18.0.0/16', '10.10.201.0/24', '2001:db8::/32'],
+    ['10.10.%d.0/24' % n for n in (100, 101, 102, 200)] + ['192.168.1.1/32', '2001:db9::/64', 'bad'],
+    ['10.10.%d.0/24' % n for n in range(100, 120)] + ['192.168.%d.0/30' % n for n in range(1, 4)]
+    + ['2001:db6::/48', '2001:db9::10/128', '172.31.0.0/16'],
+]
+
+
+@pytest.mark.parametrize('subnets', _IN_SUBNETS_LISTS, ids=lambda subnets: '%d-subnets' % len(subnets))
+def test_in_subnets_matches_or_of_in_subnet(config, subnets):
+    args = ', '.join('"%s"' % subnet for subnet in subnets)
+    any_of = ' or '.join('ip:in-subnet(., "%s")' % subnet for subnet in subnets)
+
+    found = config.xpath('//*[ip:in-subnets(., %s)]' % args, namespaces=ip_ns)
+    expected = config.xpath('//*[%s]' % any_of, namespaces=ip_ns)
+
+    assert found
+    assert found == expected
+
+
+def test_in_subnets_no_subnets(config):
+    assert config.xpath('//*[ip:in-subnets(.)]', namespaces=ip_ns) == []
@@ -0,0 +1,19 @@
+import pytest
+
+from lxml_xpath_ipaddress.in_subnet import in_subnet, in_subnets, subnet_table
+
+
+def test_in_subnets_single_subnet_string():
+    assert in_subnets('10.0.0.1', '10.0.0.0/8') is True
+    assert in_subnets('11.0.0.1', '10.0.0.0/8') is False
+    assert in_subnets('10.0.0.1', subnet_table('10.0.0.0/8')) is True
+
+
+@pytest.mark.parametrize('value', [['x'], {'10.0.0.1'}, None, 5])
+def test_in_subnets_not_an_ip_thing(value):
+    assert in_subnet(value, '10.0.0.0/8') is False
+    assert in_subnets(value, ['10.0.0.0/8']) is False
+
+
+def test_in_subnets_unhashable_subnets():
+    assert in_subnets('10.0.0.1', [['10.0.0.0/8']]) is False
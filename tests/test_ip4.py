@@ -0,0 +1,34 @@
+import pytest
+
+from lxml_xpath_ipaddress import ip4, ip4or6
+
+fipv = pytest.importorskip('fipv')
+
+_VALIDATORS = [ip4.is_any_ip4, ip4.is_net_ip4, ip4.is_host_ip4, ip4or6.is_host_ip, ip4or6.is_net_ip]
+
+# fipv accepts leading zeros that ipaddress rejects, and rejects netmask prefixes that ipaddress accepts;
+# the validators must give the same answers either way.
+
+_VALUES = ['01.2.3.4', '10.0.0.0/255.0.0.0', '10.0.0.1/8', '1.2.3.4/08', '1.2.3.4', '1.2.3.4/32',
+           '10.0.0.0/0.255.255.255', '256.1.1.1', '1.2.3.4/33']
+
+
+def _results():
+    for validator in _VALIDATORS:
+        validator.cache_clear()
+
+    return {value: [validator(value) for validator in _VALIDATORS] for value in _VALUES}
+
+
+def test_fipv_does_not_change_results(monkeypatch):
+    assert ip4.fipv is fipv
+    with_fipv = _results()
+
+    monkeypatch.setattr(ip4, 'fipv', None)
+    without_fipv = _results()
+
+    assert with_fipv == without_fipv
+    assert with_fipv['01.2.3.4'] == [False, False, False, False, False]
+    assert with_fipv['10.0.0.0/255.0.0.0'] == [True, True, False, False, True]
+    assert with_fipv['10.0.0.1/8'] == [True, True, False, False, True]
+    assert with_fipv['1.2.3.4/08'] == [True, True, False, False, True]
@@ -0,0 +1,80 @@
+from ipaddress import IPv4Address, IPv6Address, ip_network
+
+from lxml_xpath_ipaddress.in_subnet import SubnetTable, in_subnet, in_subnets, subnet_table
+from lxml_xpath_ipaddress.subnet_trie import SubnetTrie
+
+
+def _trie(width, *subnets):
+    trie = SubnetTrie(width)
+    for subnet in subnets:
+        net = ip_network(subnet)
+        trie.insert(int(net.network_address), net.prefixlen, subnet)
+    return trie
+
+
+def test_longest_prefix_match():
+    trie = _trie(32, '10.0.0.0/8', '10.10.0.0/16', '10.10.201.0/24')
+
+    assert trie.lookup(int(IPv4Address('10.10.201.5'))) == '10.10.201.0/24'
+    assert trie.lookup(int(IPv4Address('10.10.1.1'))) == '10.10.0.0/16'
+    assert trie.lookup(int(IPv4Address('10.200.1.1'))) == '10.0.0.0/8'
+    assert trie.lookup(int(IPv4Address('11.0.0.1'))) is None
+
+
+def test_default_route_matches_everything():
+    trie = _trie(32, '0.0.0.0/0', '192.168.0.0/16')
+
+    assert trie.lookup(int(IPv4Address('0.0.0.0'))) == '0.0.0.0/0'
+    assert trie.lookup(int(IPv4Address('255.255.255.255'))) == '0.0.0.0/0'
+    assert trie.lookup(int(IPv4Address('192.168.1.1'))) == '192.168.0.0/16'
+
+
+def test_host_prefix():
+    trie = _trie(32, '172.18.1.1/32', '172.18.0.0/16')
+
+    assert trie.lookup(int(IPv4Address('172.18.1.1'))) == '172.18.1.1/32'
+    assert trie.lookup(int(IPv4Address('172.18.1.2'))) == '172.18.0.0/16'
+
+
+def test_ipv6():
+    trie = _trie(128, '2001:db8::/32', '2001:db8:1::/48', '::1/128')
+
+    assert trie.lookup(int(IPv6Address('2001:db8:1::5'))) == '2001:db8:1::/48'
+    assert trie.lookup(int(IPv6Address('2001:db8:2::5'))) == '2001:db8::/32'
+    assert trie.lookup(int(IPv6Address('::1'))) == '::1/128'
+    assert trie.lookup(int(IPv6Address('::2'))) is None
+
+
+def test_in_subnets_prepared_table():
+    subnets = ['10.%d.0.0/16' % n for n in range(64)] + ['2001:db8::/32', 'bad']
+    table = subnet_table(subnets)
+
+    assert isinstance(table, SubnetTable)
+    for value in ['10.5.1.1', '10.5.0.0/16', '10.64.0.1', '2001:db8::1', '172.18.1.1', 'host-1', None]:
+        expected = any(in_subnet(value, subnet) for subnet in subnets)
+        assert in_subnets(value, table) is expected
+        assert in_subnets(value, subnets) is expected
+
+
+def test_clear_subnet_caches():
+    from lxml_xpath_ipaddress import in_subnet as mod
+
+    assert in_subnet('10.1.1.1', '10.0.0.0/8')
+    assert in_subnets('10.1.1.1', ['10.0.0.0/8'])
+
+    mod.clear_subnet_caches()
+
+    for cached in (mod._subnet_ints, mod._in_subnet_check, mod._to_subnet_table):
+        assert cached.cache_info().currsize == 0
+
+
+def test_in_subnet_canonical_cache_key():
+    from lxml_xpath_ipaddress import in_subnet as mod
+
+    mod.clear_subnet_caches()
+
+    for subnet in ['10.0.0.0/8', '10.0.0.0/8 ', ' 10.0.0.0/8']:
+        assert in_subnet('10.1.1.1', subnet)
+
+    assert mod._in_subnet_check.cache_info().currsize == 1
+    assert mod._subnet_ints.cache_info().currsize == 1